@@ -7,6 +7,8 @@ All configuration settings for the Treasury HUB application
 import os
 from pathlib import Path
 
+from excel_engine import EXCEL_ENGINE  # re-exported for database_sync
+
 # ==============================================================================
 # PROJECT STRUCTURE
 # ==============================================================================
@@ -72,6 +74,14 @@ ENABLE_SIDEBAR = True
 DB_TIMEOUT = 30  # seconds
 DB_CHECK_SAME_THREAD = False
 
+# Applied to every connection: WAL lets the app read while a sync writes
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;"
+    "PRAGMA synchronous=NORMAL;"
+    f"PRAGMA busy_timeout={DB_TIMEOUT * 1000};"
+    "PRAGMA cache_size=-65536;"
+)
+
 # Data retention
 KEEP_HISTORICAL_DATA = True
 DATA_RETENTION_MONTHS = 24  # Keep 2 years of data
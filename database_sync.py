@@ -63,6 +63,13 @@ def setup_logging():
 # DATABASE SETUP
 # ==============================================================================
 
+def connect_db(db_path=None):
+    """Open a connection to the treasury database with the shared pragmas applied"""
+    conn = sqlite3.connect(db_path or str(DATABASE_PATH), timeout=DB_TIMEOUT,
+                           check_same_thread=DB_CHECK_SAME_THREAD)
+    conn.executescript(DB_PRAGMAS)
+    return conn
+
 class TreasuryDatabase:
     """Database management for Treasury HUB"""
     
@@ -74,7 +81,7 @@ class TreasuryDatabase:
     def init_database(self):
         """Initialize database with all required tables"""
         try:
-            conn = sqlite3.connect(self.db_path, timeout=DB_TIMEOUT)
+            conn = connect_db(self.db_path)
             cursor = conn.cursor()
             
             # Cash positions table
@@ -197,8 +204,10 @@ class ExcelDataExtractor:
             # Load Excel sheets with error handling
             try:
                 self.logger.info("📖 Reading Excel sheets...")
-                dash_sheet = pd.read_excel(self.excel_file, sheet_name="Information to feed dash", header=None)
-                sheet7 = pd.read_excel(self.excel_file, sheet_name="Sheet7", header=None)
+                # One workbook handle for both sheets
+                with pd.ExcelFile(self.excel_file, engine=EXCEL_ENGINE) as xls:
+                    dash_sheet = xls.parse("Information to feed dash", header=None)
+                    sheet7 = xls.parse("Sheet7", header=None)
                 self.logger.info("✅ Excel sheets loaded successfully")
             except Exception as e:
                 raise Exception(f"Failed to read Excel sheets: {str(e)}")
@@ -236,7 +245,7 @@ class ExcelDataExtractor:
     def sync_cash_positions(self, sheet7):
         """Extract and sync cash positions by bank"""
         try:
-            conn = sqlite3.connect(self.db.db_path, timeout=DB_TIMEOUT)
+            conn = connect_db(self.db.db_path)
             
             # Clear existing cash positions for today
             today = datetime.now().date()
@@ -254,11 +263,11 @@ class ExcelDataExtractor:
             net_cash_df.dropna(subset=['amount'], inplace=True)
             
             # Insert into database
-            for _, row in net_cash_df.iterrows():
-                conn.execute('''
-                    INSERT INTO cash_positions (bank_name, currency, amount)
-                    VALUES (?, ?, ?)
-                ''', (str(row['bank_name']).strip(), 'EUR', float(row['amount'])))
+            conn.executemany('''
+                INSERT INTO cash_positions (bank_name, currency, amount)
+                VALUES (?, ?, ?)
+            ''', [(str(bank_name).strip(), 'EUR', float(amount))
+                  for bank_name, amount in zip(net_cash_df['bank_name'], net_cash_df['amount'])])
             
             conn.commit()
             conn.close()
@@ -273,7 +282,7 @@ class ExcelDataExtractor:
     def sync_cash_flow_forecast(self, dash_sheet):
         """Extract and sync cash flow forecast data"""
         try:
-            conn = sqlite3.connect(self.db.db_path, timeout=DB_TIMEOUT)
+            conn = connect_db(self.db.db_path)
             
             # Clear existing forecasts for today's sync
             today = datetime.now().date()
@@ -290,14 +299,15 @@ class ExcelDataExtractor:
                     n25 = pd.to_numeric(dash_sheet.iloc[4, 1:13], errors='coerce').fillna(0).tolist()
                     
                     # Insert 2025 data
-                    for month, inflow, outflow, net in zip(m25, i25, o25, n25):
-                        if month and month != 'nan':
-                            conn.execute('''
-                                INSERT INTO cash_flow_forecast 
-                                (month, year, inflow, outflow, net_flow, forecast_type)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            ''', (str(month), 2025, float(inflow), float(outflow), float(net), 'FORECAST'))
-                            records += 1
+                    rows = [(str(month), 2025, float(inflow), float(outflow), float(net), 'FORECAST')
+                            for month, inflow, outflow, net in zip(m25, i25, o25, n25)
+                            if month and month != 'nan']
+                    conn.executemany('''
+                        INSERT INTO cash_flow_forecast 
+                        (month, year, inflow, outflow, net_flow, forecast_type)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', rows)
+                    records += len(rows)
                 
                 # 2024 data (columns 15-26)
                 if dash_sheet.shape[1] > 26:
@@ -307,14 +317,15 @@ class ExcelDataExtractor:
                     n24 = pd.to_numeric(dash_sheet.iloc[4, 15:27], errors='coerce').fillna(0).tolist()
                     
                     # Insert 2024 data
-                    for month, inflow, outflow, net in zip(m24, i24, o24, n24):
-                        if month and month != 'nan':
-                            conn.execute('''
-                                INSERT INTO cash_flow_forecast 
-                                (month, year, inflow, outflow, net_flow, forecast_type)
-                                VALUES (?, ?, ?, ?, ?, ?)
-                            ''', (str(month), 2024, float(inflow), float(outflow), float(net), 'HISTORICAL'))
-                            records += 1
+                    rows = [(str(month), 2024, float(inflow), float(outflow), float(net), 'HISTORICAL')
+                            for month, inflow, outflow, net in zip(m24, i24, o24, n24)
+                            if month and month != 'nan']
+                    conn.executemany('''
+                        INSERT INTO cash_flow_forecast 
+                        (month, year, inflow, outflow, net_flow, forecast_type)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    ''', rows)
+                    records += len(rows)
                             
             except Exception as e:
                 self.logger.warning(f"Partial cash flow data extraction: {e}")
@@ -332,7 +343,7 @@ class ExcelDataExtractor:
     def sync_key_metrics(self, dash_sheet, sheet7):
         """Extract and sync key performance metrics"""
         try:
-            conn = sqlite3.connect(self.db.db_path, timeout=DB_TIMEOUT)
+            conn = connect_db(self.db.db_path)
             
             # Calculate key metrics from cash positions
             try:
@@ -361,12 +372,12 @@ class ExcelDataExtractor:
             today = datetime.now().date()
             conn.execute("DELETE FROM key_metrics WHERE DATE(last_updated) = ?", (today,))
             
-            for metric_name, value, change, change_pct in metrics:
-                conn.execute('''
-                    INSERT OR REPLACE INTO key_metrics 
-                    (metric_name, metric_value, metric_change, metric_change_percent)
-                    VALUES (?, ?, ?, ?)
-                ''', (metric_name, float(value), float(change), float(change_pct)))
+            conn.executemany('''
+                INSERT OR REPLACE INTO key_metrics 
+                (metric_name, metric_value, metric_change, metric_change_percent)
+                VALUES (?, ?, ?, ?)
+            ''', [(metric_name, float(value), float(change), float(change_pct))
+                  for metric_name, value, change, change_pct in metrics])
             
             conn.commit()
             conn.close()
@@ -381,7 +392,7 @@ class ExcelDataExtractor:
     def log_sync_status(self, status, records, error_msg, file_modified_time, sync_duration, sync_type):
         """Log sync operation status"""
         try:
-            conn = sqlite3.connect(self.db.db_path, timeout=DB_TIMEOUT)
+            conn = connect_db(self.db.db_path)
             conn.execute('''
                 INSERT INTO sync_log 
                 (file_path, file_modified_time, status, records_processed, error_message, sync_duration_seconds, sync_type)
@@ -472,19 +483,30 @@ class DataReader:
     def __init__(self, db_path=None):
         self.db_path = db_path or str(DATABASE_PATH)
         self.logger = logging.getLogger(__name__)
+        self._conn = None
+    
+    @property
+    def conn(self):
+        """Read connection, opened on first use and reused for every query"""
+        if self._conn is None:
+            self._conn = connect_db(self.db_path)
+        return self._conn
+    
+    def close(self):
+        """Close the shared read connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
     
     def get_sync_status(self):
         """Get last sync information"""
         try:
-            conn = sqlite3.connect(self.db_path, timeout=DB_TIMEOUT)
-            df = pd.read_sql_query("""
+            return pd.read_sql_query("""
                 SELECT sync_timestamp, status, records_processed, sync_duration_seconds, sync_type
                 FROM sync_log 
                 ORDER BY sync_timestamp DESC 
                 LIMIT 1
-            """, conn)
-            conn.close()
-            return df
+            """, self.conn, dtype_backend='pyarrow')
         except Exception as e:
             self.logger.error(f"Error getting sync status: {e}")
             return pd.DataFrame()
@@ -492,7 +514,7 @@ class DataReader:
     def get_data_summary(self):
         """Get summary of all data in database"""
         try:
-            conn = sqlite3.connect(self.db_path, timeout=DB_TIMEOUT)
+            conn = self.conn
             
             # Count records in each table
             tables = ['cash_positions', 'cash_flow_forecast', 'fx_deals', 'key_metrics', 'sync_log']
@@ -505,7 +527,6 @@ class DataReader:
                 except:
                     summary[table] = 0
             
-            conn.close()
             return summary
         except Exception as e:
             self.logger.error(f"Error getting data summary: {e}")
@@ -697,7 +718,7 @@ def create_sample_data():
         print("🧪 Creating sample data for testing...")
         
         db = TreasuryDatabase(str(DATABASE_PATH))
-        conn = sqlite3.connect(str(DATABASE_PATH), timeout=DB_TIMEOUT)
+        conn = connect_db(str(DATABASE_PATH))
         
         # Sample cash positions
         sample_banks = [
@@ -0,0 +1,11 @@
+"""
+Treasury HUB - Excel reader engine
+==================================
+Shared by the dashboard app and the database sync, which must agree on how the workbook is parsed.
+Kept out of config.py because importing config creates the data/log folders.
+"""
+
+import importlib.util
+
+# Rust-backed calamine parses xlsx several times faster than openpyxl; use it when installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"